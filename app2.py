@@ -1,9 +1,13 @@
 import streamlit as st
-import requests
-import feedparser
-from datetime import datetime
-import time
-from utils2 import classify_with_mistral, fetch_news_from_rss
+from utils2 import (
+    CLASSIFY_BATCH_SIZE,
+    MISTRAL_MODEL,
+    RSS_FEEDS,
+    ModelNotFoundError,
+    classify_articles_with_mistral,
+    iter_news_from_rss,
+    prefilter
+)
 
 # ============ PAGE CONFIG ============
 st.set_page_config(
@@ -55,24 +59,29 @@ st.markdown('<div class="main-title">📰 AI News Curator - Plan B</div>', unsaf
 st.markdown("*Real-time AI news | Mistral 7B | 100% Local & Private | $0 Cost*")
 
 # =========== PERSONAS ============
-PERSONAS = {
-    "Developers and Programmers": {
-        "keywords": ["python", "api", "framework", "code", "algorithm", "tool", "library", "sdk"],
-        "description": "For developers building AI applications"
-    },
-    "Investors and VCs": {
-        "keywords": ["startup", "funding", "investment", "market", "growth", "valuation", "series"],
-        "description": "For investors tracking AI company news"
-    },
-    "Students and Researchers": {
-        "keywords": ["paper", "research", "study", "experiment", "model", "dataset", "breakthrough"],
-        "description": "For academics and researchers"
+@st.cache_resource
+def load_personas():
+    """
+    Build the persona table once per server process instead of on every rerun.
+    """
+    return {
+        "Developers and Programmers": {
+            "keywords": ["python", "api", "framework", "code", "algorithm", "tool", "library", "sdk"],
+            "description": "For developers building AI applications"
+        },
+        "Investors and VCs": {
+            "keywords": ["startup", "funding", "investment", "market", "growth", "valuation", "series"],
+            "description": "For investors tracking AI company news"
+        },
+        "Students and Researchers": {
+            "keywords": ["paper", "research", "study", "experiment", "model", "dataset", "breakthrough"],
+            "description": "For academics and researchers"
+        }
     }
-}
+
+PERSONAS = load_personas()
 
 # ============ INITIALIZE SESSION STATE ============
-if "articles" not in st.session_state:
-    st.session_state.articles = []
 if "persona" not in st.session_state:
     st.session_state.persona = None
 if "relevant_articles" not in st.session_state:
@@ -99,7 +108,7 @@ with st.sidebar:
     )
     
     st.markdown("### 🤖 AI Model")
-    st.info("**Using:** Mistral 7B\n**Status:** ✅ Running locally\n**Port:** 11434")
+    st.info(f"**Using:** Mistral 7B (`{MISTRAL_MODEL}`)\n**Status:** ✅ Running locally\n**Port:** 11434")
     
     st.markdown("### ℹ️ System Info")
     col1, col2 = st.columns(2)
@@ -119,36 +128,60 @@ with col3:
 
 # ============ FETCH AND CLASSIFY LOGIC ============
 if fetch_button:
-    # Step 1: Fetch articles
-    with st.spinner("🔍 Fetching real AI news from 3 sources..."):
-        articles = fetch_news_from_rss()
-        st.session_state.articles = articles
-    
-    # Show success
-    st.markdown(f'<div class="status-box status-success">✅ Fetched {len(articles)} articles from RSS feeds</div>', 
-              unsafe_allow_html=True)
-    
-    # Step 2: Classify articles
-    with st.spinner(f"🤖 Classifying with Mistral 7B for {selected_persona}..."):
-        relevant_articles = []
-        progress_bar = st.progress(0)
-        
-        for idx, article in enumerate(articles):
-            is_relevant = classify_with_mistral(
-                article["title"],
-                article["summary"],
-                selected_persona
-            )
+    try:
+        with st.spinner(f"🔍 Fetching AI news and classifying with Mistral 7B for {selected_persona}..."):
+            progress_bar = st.progress(0)
+            
+            relevant_articles, undecided = [], []
+            fetched, feeds_done = 0, 0
             
-            if is_relevant:
-                relevant_articles.append(article)
+            # Classify each feed as it arrives while slower feeds are still downloading
+            for feed_articles in iter_news_from_rss():
+                fetched += len(feed_articles)
+                feeds_done += 1
+                progress_bar.progress(feeds_done / len(RSS_FEEDS))
+                
+                # Cheap keyword prefilter settles clear-cut articles; only the rest reach Mistral
+                for article in feed_articles:
+                    verdict = prefilter(article, selected_persona)
+                    if verdict:
+                        relevant_articles.append(article)
+                    elif verdict is None:
+                        undecided.append(article)
+                
+                # Batched Mistral calls once a full batch is waiting
+                if len(relevant_articles) < num_articles and len(undecided) >= CLASSIFY_BATCH_SIZE:
+                    relevant_articles += classify_articles_with_mistral(
+                        undecided,
+                        selected_persona,
+                        limit=num_articles - len(relevant_articles)
+                    )
+                    undecided = []
+                
+                if len(relevant_articles) >= num_articles:
+                    break  # Enough found, skip the remaining feeds
+            
+            # Whatever is left once every feed has arrived
+            if len(relevant_articles) < num_articles and undecided:
+                relevant_articles += classify_articles_with_mistral(
+                    undecided,
+                    selected_persona,
+                    limit=num_articles - len(relevant_articles)
+                )
+            relevant_articles = relevant_articles[:num_articles]
             
-            progress = (idx + 1) / len(articles)
-            progress_bar.progress(progress)
+            progress_bar.progress(1.0)
+            progress_bar.empty()
+            st.session_state.relevant_articles = relevant_articles
+            st.session_state.persona = selected_persona
         
-        progress_bar.empty()
-        st.session_state.relevant_articles = relevant_articles
-        st.session_state.persona = selected_persona
+    except ModelNotFoundError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    
+    # Show success
+    st.markdown(f'<div class="status-box status-success">✅ Fetched {fetched} articles from RSS feeds</div>', 
+              unsafe_allow_html=True)
 
 # ============ DISPLAY RESULTS ============
 if st.session_state.relevant_articles and st.session_state.persona == selected_persona:
@@ -217,4 +250,11 @@ with st.expander("📚 About This App"):
     - **Streamlit**: Python web framework
     - **Feedparser**: RSS feed parsing
     - **Utils**: Custom utility functions
-    """)
+    
+    ### 📥 Setup
+    ```bash
+    pip install -r requirements.txt
+    ollama pull {model}
+    ollama serve
+    ```
+    """.format(model=MISTRAL_MODEL))
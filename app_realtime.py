@@ -1,13 +1,19 @@
 import streamlit as st
-import subprocess
-import json
+import orjson
 import re
 import feedparser
 import requests
+from lxml import etree
+import hashlib
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from datetime import timedelta
-from bs4 import BeautifulSoup
+import html
 import os
+from contextlib import closing
+from types import MappingProxyType
 
 # ============================================
 # CONFIGURATION
@@ -16,6 +22,10 @@ import os
 # Configure Ollama to use port 11435 if 11434 is stuck
 os.environ['OLLAMA_HOST'] = '127.0.0.1:11435'
 
+# 4-bit quantized Mistral: ~4 GB instead of ~14 GB, roughly 2x faster decoding.
+# Use "mistral:7b-instruct-q5_K_M" if persona picks get noticeably worse.
+MISTRAL_MODEL = "mistral:7b-instruct-q4_K_M"
+
 st.set_page_config(
     page_title="AI News Curator (Plan A)",
     page_icon="🤖",
@@ -59,80 +69,321 @@ PERSONAS = [
 # FETCH REAL NEWS FROM RSS FEEDS
 # ============================================
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+# Matches HTML tags, including one left unclosed by the 300-char truncation
+HTML_TAG_RE = re.compile(r"<[^>]*(?:>|$)")
+
+@st.cache_resource
+def get_feed_session():
+    """
+    Shared HTTP session for feed fetches, kept across reruns so pooled
+    keep-alive connections are reused on every refresh.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Some feeds throttle or block the default python-requests agent
+    session.headers["User-Agent"] = "ai-news-curator/1.0"
+    return session
+
+FEED_SESSION = get_feed_session()
+
+@st.cache_resource
+def get_feed_cache():
+    """
+    Conditional-GET state per feed URL: {"etag", "modified", "content"}.
+    Cached as a resource so it outlives the 5-minute fetch cache and script reruns.
+    """
+    return {}
+
+FEED_CACHE = get_feed_cache()
+
+def fetch_feed_bytes(feed_url):
+    """
+    Downloads the raw bytes of a single RSS feed.
+    Unchanged feeds (HTTP 304) return the previously downloaded bytes.
+    """
+    state = FEED_CACHE.get(feed_url, {})
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("modified"):
+        headers["If-Modified-Since"] = state["modified"]
+    
+    resp = FEED_SESSION.get(feed_url, headers=headers, timeout=5)
+    if resp.status_code == 304 and "content" in state:
+        return state["content"]
+    resp.raise_for_status()
+    
+    FEED_CACHE[feed_url] = {
+        "etag": resp.headers.get("ETag"),
+        "modified": resp.headers.get("Last-Modified"),
+        "content": resp.content
+    }
+    
+    return resp.content
+
+# No entity expansion or network access while parsing untrusted feed XML
+XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+def xml_text(element):
+    """
+    Returns all text inside an element (covers CDATA and inline XHTML).
+    """
+    return "".join(element.itertext()).strip() if element is not None else ""
+
+def find_child(element, name):
+    """
+    Finds a child in the feed's own vocabulary: unqualified (RSS 2.0), Atom or RSS 1.0.
+    Extension elements like media:title or itunes:title never shadow the real one.
+    """
+    for tag in (name, ATOM_NS + name, RSS1_NS + name):
+        child = element.find(tag)
+        if child is not None:
+            return child
+    return None
+
+def extract_feed_entries(raw_bytes, limit=5):
+    """
+    Extracts title/link/summary/published from RSS or Atom XML in a single lxml pass.
+    Raises etree.XMLSyntaxError on malformed XML.
+    """
+    root = etree.fromstring(raw_bytes, parser=XML_PARSER)
+    entries = []
+    
+    for item in root.iterfind(".//{*}item"):  # RSS 2.0 and RSS 1.0 (RDF)
+        entries.append({
+            "title": xml_text(find_child(item, "title")),
+            "link": xml_text(item.find("link")) or xml_text(item.find(RSS1_NS + "link")),
+            "summary": xml_text(find_child(item, "description")),
+            "published": xml_text(find_child(item, "pubDate")) or xml_text(item.find(DC_NS + "date"))
+        })
+        if len(entries) >= limit:
+            return entries
+    
+    for entry in root.iterfind(".//{*}entry"):  # Atom
+        link = entry.find(ATOM_NS + "link[@rel='alternate']")
+        if link is None:
+            link = entry.find(ATOM_NS + "link")
+        entries.append({
+            "title": xml_text(find_child(entry, "title")),
+            "link": link.get("href", "") if link is not None else "",
+            "summary": xml_text(find_child(entry, "summary")) or xml_text(find_child(entry, "content")),
+            "published": xml_text(find_child(entry, "published")) or xml_text(find_child(entry, "updated"))
+        })
+        if len(entries) >= limit:
+            break
+    
+    return entries
+    
+    for entry in root.iterfind(".//{*}entry"):  # Atom
+        link = entry.find("{*}link[@rel='alternate']")
+        if link is None:
+            link = entry.find("{*}link")
+        entries.append({
+            "title": xml_text(entry.find("{*}title")),
+            "link": link.get("href", "") if link is not None else "",
+            "summary": xml_text(entry.find("{*}summary")) or xml_text(entry.find("{*}content")),
+            "published": xml_text(entry.find("{*}published")) or xml_text(entry.find("{*}updated"))
+        })
+        if len(entries) >= limit:
+            break
+    
+    return entries
+
+@st.cache_resource(max_entries=2 * len(AI_NEWS_SOURCES))  # Same bytes => skip parsing
+def parse_feed(raw_bytes, source_name):
+    """
+    Parses raw RSS bytes into articles, using lxml with a feedparser fallback.
+    Returns the top 5 articles from that feed.
+    """
+    try:
+        entries = extract_feed_entries(raw_bytes)
+    except etree.XMLSyntaxError:
+        entries = []
+    
+    if not entries:
+        # Malformed or unusual feed: let the more tolerant feedparser handle it
+        entries = feedparser.parse(raw_bytes).entries[:5]
+    
+    articles = []
+    for entry in entries:
+        article = {
+            "title": entry.get("title") or "No title",
+            "link": entry.get("link") or "",
+            "summary": (entry.get("summary") or "")[:300],  # Truncate to 300 chars
+            "published": entry.get("published") or "Recently",
+            "source": source_name,
+            "domain": "AI Research" if "arxiv" in source_name.lower() else "AI News"
+        }
+        
+        # Clean up summary (remove HTML tags)
+        article["summary"] = html.unescape(HTML_TAG_RE.sub("", article["summary"]))
+        
+        articles.append(article)
+    
+    return articles
+
+@st.cache_resource(ttl=300)  # Cache for 5 minutes, shared by reference (no pickling per rerun)
 def fetch_real_ai_news():
     """
     Fetches real AI news from RSS feeds.
-    Returns list of articles with title, link, summary, source.
+    All feeds are downloaded concurrently, so total time is the slowest feed;
+    parsing happens here on the script thread and is cached per feed content.
+    Returns a tuple of read-only articles with title, link, summary, source.
+    The result is shared across reruns, so callers must not mutate it.
     """
-    all_articles = []
+    results = {}
     
-    for source_name, feed_url in AI_NEWS_SOURCES.items():
-        try:
-            feed = feedparser.parse(feed_url)
-            
-            for entry in feed.entries[:5]:  # Get top 5 from each source
-                article = {
-                    "title": entry.get("title", "No title"),
-                    "link": entry.get("link", ""),
-                    "summary": entry.get("summary", "")[:300],  # Truncate to 300 chars
-                    "published": entry.get("published", "Recently"),
-                    "source": source_name,
-                    "domain": "AI Research" if "arxiv" in source_name.lower() else "AI News"
-                }
-                
-                # Clean up summary (remove HTML tags)
-                article["summary"] = BeautifulSoup(article["summary"], "html.parser").get_text()
-                
-                all_articles.append(article)
+    with ThreadPoolExecutor(max_workers=len(AI_NEWS_SOURCES)) as executor:
+        futures = {
+            executor.submit(fetch_feed_bytes, feed_url): source_name
+            for source_name, feed_url in AI_NEWS_SOURCES.items()
+        }
         
-        except Exception as e:
-            st.warning(f"Could not fetch from {source_name}: {str(e)}")
-            continue
+        for future in as_completed(futures):
+            source_name = futures[future]
+            try:
+                results[source_name] = parse_feed(future.result(), source_name)
+            except Exception as e:
+                st.warning(f"Could not fetch from {source_name}: {str(e)}")
+                continue
     
-    return all_articles
+    # Keep source order stable so downstream prompts (and their cache keys) are deterministic
+    return tuple(
+        MappingProxyType(article)
+        for source_name in AI_NEWS_SOURCES
+        for article in results.get(source_name, [])
+    )
 
 # ============================================
 # USE MISTRAL TO CURATE FOR PERSONA
 # ============================================
 
-def run_llm_model(prompt_text, model="mistral"):
+@st.cache_resource
+def get_llm_cache():
+    """
+    Curation results persisted on disk so a Streamlit restart doesn't throw them away.
+    Cached as a resource so the SQLite store is opened once, not on every rerun.
+    """
+    return Cache(".llm_cache")
+
+LLM_CACHE = get_llm_cache()
+LLM_CACHE_TTL = 3600  # 1 hour
+
+@st.cache_resource
+def get_ollama_session():
+    """
+    Shared HTTP session for Ollama, kept across reruns so every prompt
+    reuses the same keep-alive connection to 'ollama serve'.
+    """
+    return requests.Session()
+
+OLLAMA_SESSION = get_ollama_session()
+
+def stream_llm_model(prompt_text, model=MISTRAL_MODEL):
     """
-    Runs the LLM model locally using Ollama.
-    Tries both port 11434 and 11435.
+    Streams the LLM response from the Ollama HTTP API, yielding text as it is generated.
+    Tries both port 11434 and 11435. Closing the generator aborts the generation.
     """
     ports = [11435, 11434]  # Try 11435 first (less congested)
+    model_missing = False
     
     for port in ports:
         try:
-            host = f"127.0.0.1:{port}"
-            process = subprocess.Popen(
-                ["ollama", "run", model],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env={**os.environ, 'OLLAMA_HOST': host}
+            resp = OLLAMA_SESSION.post(
+                f"http://127.0.0.1:{port}/api/generate",
+                json={
+                    "model": model,
+                    "prompt": prompt_text,
+                    "stream": True,
+                    "keep_alive": "30m"  # Keep the model loaded between prompts
+                },
+                stream=True,
+                timeout=300
             )
-            
-            try:
-                output, error = process.communicate(input=prompt_text + "\n", timeout=300)
-            except subprocess.TimeoutExpired:
-                process.kill()
-                st.error("Time-out: Model took >5 minutes.")
-                return ""
-            
-            if error and "error" in error.lower():
-                continue  # Try next port
-            
-            return output
+        
+        except requests.exceptions.Timeout:
+            st.error("Time-out: Model took >5 minutes.")
+            return
         
         except Exception as e:
             if port == ports[-1]:  # Last port tried
                 st.error(f"ERROR: Ollama not responding on any port. Make sure 'ollama serve' is running.")
             continue
-    
-    return ""
+        
+        if resp.status_code != 200:
+            with resp:
+                try:
+                    error = str(orjson.loads(resp.content).get("error", ""))
+                except (orjson.JSONDecodeError, AttributeError):
+                    error = ""
+            model_missing = model_missing or "not found" in error.lower()
+            continue  # Try next port, which may have the model pulled
+        
+        with resp:
+            try:
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    yield chunk.get("response", "")
+                    if chunk.get("done"):
+                        break
+            except requests.exceptions.RequestException:
+                st.error("Time-out: Model stopped responding mid-stream.")
+        return
+    
+    if model_missing:
+        st.error(f"ERROR: Model '{model}' is not pulled in Ollama. Run: ollama pull {model}")
+
+# One pass over a curated block: INDEX then RELEVANCE
+CURATED_ITEM_RE = re.compile(
+    r"INDEX:\s*\[?(?P<index>\d+)\]?\s*"
+    r"RELEVANCE:\s*(?P<relevance>[^\n]+)"
+)
+
+def parse_curated_section(section, candidates):
+    """
+    Parses one '---' separated block of Mistral's curation output.
+    Title, source and link come from the candidate list by index, so they can't be hallucinated.
+    Returns (index, item dict), or None if the block doesn't match the format.
+    """
+    match = CURATED_ITEM_RE.search(section)
+    if not match:
+        return None
+    
+    index = int(match.group("index"))
+    if not 1 <= index <= len(candidates):
+        return None
+    
+    article = candidates[index - 1]
+    return index, {
+        "title": article["title"],
+        "source": article["source"],
+        "relevance": match.group("relevance").strip(),
+        "link": article["link"]
+    }
+
+# Identical on every call, so Ollama can reuse the KV cache it already built for
+# these tokens; only the persona and article list at the end need prefilling.
+CURATION_PROMPT_PREFIX = """You are an AI news curator. You will be given a persona and a numbered list of real AI news articles.
+Select the articles that matter most to that persona. Be selective and relevant.
+
+For each selected article, output EXACTLY this format:
+
+INDEX: [article number]
+RELEVANCE: [brief explanation of why this is relevant to the persona]
+---
+"""
 
 def curate_articles_for_persona(articles, persona, num_updates):
     """
@@ -141,61 +392,69 @@ def curate_articles_for_persona(articles, persona, num_updates):
     if not articles:
         return []
     
-    # Create a summary of articles to send to Mistral
-    articles_text = "\n\n".join([
-        f"Title: {a['title']}\nSource: {a['source']}\nSummary: {a['summary']}\nLink: {a['link']}"
-        for a in articles[:15]  # Limit to top 15 articles
-    ])
+    candidates = articles[:15]  # Limit to top 15 articles
     
-    prompt = f"""You are an AI news curator. Filter these {len(articles)} real AI news articles 
-and select the TOP {num_updates} most relevant for: {persona}
-
-Articles:
-{articles_text}
-
-For each selected article, output EXACTLY this format:
-
-TITLE: [headline]
-SOURCE: [source name]
-RELEVANCE: [brief explanation of why this is relevant to {persona}]
-LINK: [exact URL from the article]
----
-
-Select {num_updates} articles that matter most to {persona}. Be selective and relevant."""
+    # Same persona + same article set => same curation, regardless of article order
+    article_digest = hashlib.blake2b(
+        "\n".join(sorted(a["title"] + a["summary"] for a in candidates)).encode("utf-8")
+    ).hexdigest()
+    cache_key = ("curate", persona, num_updates, article_digest)
+    cached = LLM_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     
-    response = run_llm_model(prompt, model="mistral")
+    # Compact listing: source and link are recovered by index, so they stay out of the prompt
+    articles_text = "\n".join(
+        f"[{idx}] {a['title']} — {a['summary'][:160]}"
+        for idx, a in enumerate(candidates, 1)
+    )
     
-    if not response:
-        return articles[:num_updates]  # Fallback to raw articles
+    # Fixed instructions first, variable persona/articles last (see CURATION_PROMPT_PREFIX)
+    prompt = CURATION_PROMPT_PREFIX + f"""
+Persona: {persona}
+Select the TOP {num_updates} of these {len(candidates)} articles.
+
+Articles:
+{articles_text}"""
     
-    # Parse Mistral's recommendations
+    # Parse Mistral's recommendations as they stream in
     curated = []
-    sections = response.split("---")
+    seen_idx = set()  # Dedupe on the picked index; missing links are all "", so they can't be the key
+    buffer = ""
+    got_response = False
+    preview = st.empty()
+    
+    with closing(stream_llm_model(prompt, model=MISTRAL_MODEL)) as stream:
+        for text in stream:
+            got_response = got_response or bool(text)
+            buffer += text
+            *sections, buffer = buffer.split("---")
+            
+            for section in sections:
+                parsed = parse_curated_section(section, candidates)
+                if parsed and parsed[0] not in seen_idx:
+                    seen_idx.add(parsed[0])
+                    curated.append(parsed[1])
+            
+            if sections and curated:
+                preview.markdown("\n".join(f"{idx}. {item['title']}" for idx, item in enumerate(curated, 1)))
+            
+            if len(curated) >= num_updates:
+                break  # Enough items, stop Mistral generating the rest
+        else:
+            # Stream finished; the last block may not end with '---'
+            parsed = parse_curated_section(buffer, candidates)
+            if parsed and parsed[0] not in seen_idx:
+                seen_idx.add(parsed[0])
+                curated.append(parsed[1])
+    
+    preview.empty()
+    
+    if not got_response:
+        return articles[:num_updates]  # Fallback to raw articles
     
-    for section in sections:
-        if not section.strip():
-            continue
-        
-        lines = section.strip().split("\n")
-        item = {
-            "title": "",
-            "source": "",
-            "relevance": "",
-            "link": ""
-        }
-        
-        for line in lines:
-            if line.startswith("TITLE:"):
-                item["title"] = line.replace("TITLE:", "").strip()
-            elif line.startswith("SOURCE:"):
-                item["source"] = line.replace("SOURCE:", "").strip()
-            elif line.startswith("RELEVANCE:"):
-                item["relevance"] = line.replace("RELEVANCE:", "").strip()
-            elif line.startswith("LINK:"):
-                item["link"] = line.replace("LINK:", "").strip()
-        
-        if item["title"] and item["link"]:
-            curated.append(item)
+    if curated:
+        LLM_CACHE.set(cache_key, curated[:num_updates], expire=LLM_CACHE_TTL)
     
     return curated[:num_updates] if curated else articles[:num_updates]
 
@@ -227,7 +486,7 @@ model_choice = st.sidebar.radio(
 )
 
 model_map = {
-    "Mistral 7B (Fast)": "mistral",
+    "Mistral 7B (Fast)": MISTRAL_MODEL,
     "Llama 2 (Balanced)": "llama2",
     "DeepSeek-R1 (Slow)": "deepseek-r1"
 }
@@ -460,7 +719,7 @@ with tab4:
     
     **2. Download Mistral:**
     ```bash
-    ollama pull mistral
+    ollama pull mistral:7b-instruct-q4_K_M
     ```
     
     **3. Start Ollama on Port 11435:**
@@ -471,7 +730,7 @@ with tab4:
     
     **4. Install Python packages:**
     ```bash
-    pip install streamlit feedparser requests beautifulsoup4
+    pip install -r requirements.txt
     ```
     
     **5. Run App:**
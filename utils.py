@@ -1,25 +1,32 @@
-import subprocess
-import json
+import requests
+import orjson
+
+# Persistent session so every prompt reuses the same connection to 'ollama serve'
+OLLAMA_SESSION = requests.Session()
 
 def run_thinking_model(prompt_json):
     """
-    Runs DeepSeek-R1 locally using Ollama and returns JSON output.
+    Runs DeepSeek-R1 locally using the Ollama HTTP API and returns JSON output.
     """
 
-    process = subprocess.Popen(
-        ["ollama", "run", "deepseek-r1", "--format", "json"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-
-    output, error = process.communicate(prompt_json + "\n")
-
-    if error:
-        print("Model error:", error)
+    try:
+        response = OLLAMA_SESSION.post(
+            "http://127.0.0.1:11435/api/generate",
+            json={
+                "model": "deepseek-r1",
+                "prompt": prompt_json,
+                "format": "json",
+                "stream": False,
+                "keep_alive": "30m"
+            },
+            timeout=300
+        )
+        response.raise_for_status()
+    except Exception as e:
+        print("Model error:", e)
+        return ""
 
-    return output
+    return orjson.loads(response.content)["response"]
 
 
 def generate_ai_updates():
@@ -55,7 +62,7 @@ def generate_ai_updates():
 }
 
 
-    prompt_text = json.dumps(prompt, indent=2)
+    prompt_text = orjson.dumps(prompt, option=orjson.OPT_INDENT_2).decode()
     response = run_thinking_model(prompt_text)
 
     return response
@@ -1,6 +1,21 @@
+import os
+import re
+import html
+import time
+import hashlib
+import threading
+import orjson
 import requests
 import feedparser
-from typing import List, Dict
+from io import BytesIO
+from lxml import etree
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict, deque
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Dict, Optional, Tuple
 
 # ============ RSS FEED SOURCES ============
 RSS_FEEDS = {
@@ -13,34 +28,670 @@ RSS_FEEDS = {
 }
 
 
+# 4-bit quantized Mistral: ~4 GB instead of ~14 GB, roughly 2x faster decoding.
+# Use "mistral:7b-instruct-q5_K_M" if classification accuracy suffers.
+MISTRAL_MODEL = "mistral:7b-instruct-q4_K_M"
+
+
+# Shared HTTP session so parallel feed fetches reuse pooled keep-alive connections
+FEED_SESSION = requests.Session()
+_FEED_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+)
+FEED_SESSION.mount("https://", _FEED_ADAPTER)
+FEED_SESSION.mount("http://", _FEED_ADAPTER)
+# Some feeds throttle or block the default python-requests agent
+FEED_SESSION.headers["User-Agent"] = "ai-news-curator/1.0"
+
+# Per-feed ETag / Last-Modified plus the parsed articles, persisted across restarts
+# so unchanged feeds come back as an empty 304 and skip parsing entirely
+FEED_CACHE = Cache(".feed_cache")
+# Bump whenever parsing or cleaning changes, so 304s can't keep serving old output
+FEED_CACHE_VERSION = 2
+
+
+# ============ FEED PARSING ============
+_HTML_TAG_RE = re.compile(r"<[^>]+>")  # Complete tags only: summaries are stripped before they are cut
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _clean_summary(raw: str, limit: int = 300) -> str:
+    """Plain-text summary: tags stripped, entities decoded, whitespace collapsed, then cut."""
+    text = html.unescape(_HTML_TAG_RE.sub(" ", raw))
+    return _WHITESPACE_RE.sub(" ", text).strip()[:limit]
+
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_RSS1_NS = "{http://purl.org/rss/1.0/}"
+_DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+
+def _xml_text(element) -> str:
+    """All text inside an element (covers CDATA and inline XHTML)."""
+    return "".join(element.itertext()).strip() if element is not None else ""
+
+
+def _find_child(element, name: str):
+    """
+    Find a child in the feed's own vocabulary: unqualified (RSS 2.0), Atom or RSS 1.0.
+    
+    Extension elements such as media:title or itunes:title are never matched,
+    so they can't shadow the item's real title/description/link.
+    """
+    for tag in (name, _ATOM_NS + name, _RSS1_NS + name):
+        child = element.find(tag)
+        if child is not None:
+            return child
+    return None
+
+
+def _iter_feed_entries(raw_bytes: bytes, limit: int = 5) -> List[Dict]:
+    """
+    Stream-parse RSS or Atom bytes with lxml, stopping after `limit` entries.
+    
+    Raises:
+        etree.XMLSyntaxError: If the feed is not well-formed XML
+    """
+    entries = []
+    
+    for _, element in etree.iterparse(
+        BytesIO(raw_bytes),
+        events=("end",),
+        tag=("{*}item", "{*}entry"),
+        resolve_entities=False,
+        no_network=True
+    ):
+        if etree.QName(element).localname == "entry":  # Atom
+            link = element.find(_ATOM_NS + "link[@rel='alternate']")
+            if link is None:
+                link = element.find(_ATOM_NS + "link")
+            entries.append({
+                "title": _xml_text(_find_child(element, "title")),
+                "summary": _xml_text(_find_child(element, "summary")) or _xml_text(_find_child(element, "content")),
+                "link": link.get("href", "") if link is not None else "",
+                "published": _xml_text(_find_child(element, "published")) or _xml_text(_find_child(element, "updated"))
+            })
+        else:  # RSS 2.0 / RSS 1.0
+            entries.append({
+                "title": _xml_text(_find_child(element, "title")),
+                "summary": _xml_text(_find_child(element, "description")),
+                "link": _xml_text(element.find("link")) or _xml_text(element.find(_RSS1_NS + "link")),
+                "published": _xml_text(_find_child(element, "pubDate")) or _xml_text(element.find(_DC_NS + "date"))
+            })
+        
+        element.clear()
+        if len(entries) >= limit:
+            break  # The rest of the document is never parsed
+    
+    return entries
+
+
 # ============ FETCH NEWS FUNCTION ============
+def fetch_feed_articles(source_name: str, feed_url: str) -> List[Dict]:
+    """
+    Fetch and parse a single RSS feed.
+    
+    Args:
+        source_name: Display name of the feed
+        feed_url: URL of the RSS feed
+        
+    Returns:
+        List of up to 5 article dictionaries from this feed
+    """
+    cached = FEED_CACHE.get(feed_url)
+    if cached and cached.get("version") != FEED_CACHE_VERSION:
+        cached = None  # Parsed by an older parser; refetch in full instead of trusting a 304
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    
+    response = FEED_SESSION.get(feed_url, headers=headers, timeout=5)
+    if response.status_code == 304 and cached:
+        return cached["parsed"]
+    response.raise_for_status()
+    
+    try:
+        entries = _iter_feed_entries(response.content)  # Get top 5 from each source
+    except etree.XMLSyntaxError:
+        entries = []
+    if not entries:
+        # Malformed or unusual feed: let the more tolerant feedparser handle it
+        entries = feedparser.parse(response.content).entries[:5]
+    
+    articles = []
+    for entry in entries:
+        article = {
+            "title": entry.get("title") or "No title",
+            "summary": _clean_summary(entry.get("summary") or "") or "No summary",
+            "link": entry.get("link") or "#",
+            "source": source_name,
+            "published": entry.get("published") or "Unknown"
+        }
+        articles.append(article)
+    
+    FEED_CACHE.set(feed_url, {
+        "version": FEED_CACHE_VERSION,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "parsed": articles
+    })
+    
+    return articles
+
+
+def iter_news_from_rss() -> Iterator[List[Dict]]:
+    """
+    Fetch all configured RSS feeds concurrently, yielding each feed's
+    articles as soon as that feed completes.
+    
+    Callers can start classifying the first feed while slower ones are still
+    downloading; stopping iteration early cancels feeds not yet started.
+    
+    Yields:
+        List of article dictionaries with title, summary, link, source
+    """
+    executor = ThreadPoolExecutor(max_workers=len(RSS_FEEDS))
+    futures = {
+        executor.submit(fetch_feed_articles, source_name, feed_url): source_name
+        for source_name, feed_url in RSS_FEEDS.items()
+    }
+    
+    try:
+        for future in as_completed(futures):
+            source_name = futures[future]
+            try:
+                articles = future.result()
+            except Exception as e:
+                print(f"⚠️ Could not fetch from {source_name}: {str(e)}")
+                continue
+            yield articles
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def fetch_news_from_rss() -> List[Dict]:
     """
-    Fetch news from all configured RSS feeds.
+    Fetch news from all configured RSS feeds concurrently.
     
     Returns:
         List of article dictionaries with title, summary, link, source
     """
-    all_articles = []
+    return [article for articles in iter_news_from_rss() for article in articles]
+
+# ============ CLASSIFICATION CACHE ============
+# Persisted on disk so a Streamlit restart doesn't throw away LLM verdicts
+LLM_CACHE = Cache(".llm_cache")
+LLM_CACHE_TTL = 3600  # 1 hour
+SEEN_LINK_TTL = 7 * 24 * 3600  # Feeds keep re-serving the same links for days
+
+# Requests in flight to Ollama at once; set CURATOR_OLLAMA_PARALLEL to the number the
+# server decodes in parallel (the server's own OLLAMA_NUM_PARALLEL=0 means "auto")
+OLLAMA_PARALLEL_REQUESTS = max(1, int(os.environ.get("CURATOR_OLLAMA_PARALLEL", "4")))
+_OLLAMA_SLOTS = threading.BoundedSemaphore(OLLAMA_PARALLEL_REQUESTS)
+
+# Concurrent per-article classify requests sent to Ollama
+CLASSIFY_WORKERS = OLLAMA_PARALLEL_REQUESTS
+
+# Persistent session so classify calls reuse keep-alive connections to Ollama
+OLLAMA_SESSION = requests.Session()
+OLLAMA_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+# Request bodies are pre-encoded with orjson, so declare the type once here
+OLLAMA_SESSION.headers["Content-Type"] = "application/json"
+
+
+class ModelNotFoundError(RuntimeError):
+    """Raised when Ollama doesn't have MISTRAL_MODEL pulled."""
+
+
+def _post_chat(body: Dict, timeout: int) -> requests.Response:
+    """
+    POST a request to Ollama's /api/chat.
+    
+    Each call holds one of OLLAMA_PARALLEL_REQUESTS slots, so however many
+    threads classify at once the server's queue never grows past what it
+    decodes in parallel.
+    
+    Raises:
+        ModelNotFoundError: If Ollama answers 404 "model ... not found"
+    """
+    with _OLLAMA_SLOTS:
+        response = OLLAMA_SESSION.post(
+            "http://localhost:11434/api/chat",
+            data=orjson.dumps(body),
+            timeout=timeout
+        )
     
-    for source_name, feed_url in RSS_FEEDS.items():
+    if response.status_code == 404:
+        # Ollama reports a missing model as JSON {"error": "model '...' not found"};
+        # a plain-text 404 means a wrong endpoint, not a missing model
         try:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries[:5]:  # Get top 5 from each source
-                article = {
-                    "title": entry.get("title", "No title"),
-                    "summary": entry.get("summary", "No summary")[:300],
-                    "link": entry.get("link", "#"),
-                    "source": source_name,
-                    "published": entry.get("published", "Unknown")
-                }
-                all_articles.append(article)
-        except Exception as e:
-            print(f"⚠️ Could not fetch from {source_name}: {str(e)}")
+            error = str(orjson.loads(response.content).get("error", ""))
+        except (orjson.JSONDecodeError, AttributeError):
+            error = ""
+        if "not found" in error.lower():
+            raise ModelNotFoundError(
+                f"Ollama has no model '{body['model']}'. Run: ollama pull {body['model']}"
+            )
+    return response
+
+
+def _classification_key(persona: str, article_title: str, article_summary: str) -> tuple:
+    """
+    Build the cache key for one (persona, article) classification.
+    
+    Title and summary are normalized so whitespace/case differences between
+    refreshes (or between feeds carrying the same story) still hit the cache.
+    """
+    normalized = "\x1f".join((
+        _WHITESPACE_RE.sub(" ", article_title).strip().lower(),
+        _WHITESPACE_RE.sub(" ", article_summary).strip().lower()[:300]
+    ))
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return ("classify", persona, digest)
+
+
+def _seen_link_key(persona: str, article_link: str) -> Optional[tuple]:
+    """
+    Build the cache key recording that a link was already classified.
+    
+    A link outlives edits to its title/summary between refreshes, so it
+    catches repeats the content hash misses. Returns None for missing links.
+    """
+    if not article_link or article_link == "#":
+        return None
+    digest = hashlib.blake2b(article_link.encode("utf-8"), digest_size=8).hexdigest()
+    return ("seen", persona, digest)
+
+
+# ============ NEAR-DUPLICATE CACHE ============
+# The same story syndicated across feeds is worded slightly differently and misses
+# the exact-hash cache, so recent verdicts are also matched by word overlap.
+# Each entry is (words, exact cache key, stored_at); the verdict itself is always
+# read back from LLM_CACHE, so expiry and clearing there apply here too.
+SIMILARITY_THRESHOLD = 0.8  # Minimum Jaccard overlap to reuse a verdict
+_WORD_RE = re.compile(r"\w+")  # Same boundaries as \b, so "api_key" is one word, not "api"
+_RECENT_VERDICTS = defaultdict(lambda: deque(maxlen=1024))
+_RECENT_VERDICTS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _word_set(article_title: str, article_summary: str) -> frozenset:
+    """
+    Lowercased word set of an article, used for near-duplicate matching.
+    
+    Memoized so the prefilter and the cache lookup/store for every persona
+    share one tokenization per article instead of each redoing it.
+    """
+    return frozenset(_WORD_RE.findall(f"{article_title} {article_summary}".lower()))
+
+
+def _lookup_similar_verdict(persona: str, words: frozenset) -> Optional[bool]:
+    """Return the verdict of the most similar recent article, if similar enough."""
+    cutoff = time.time() - LLM_CACHE_TTL
+    candidates = []
+    
+    with _RECENT_VERDICTS_LOCK:
+        entries = _RECENT_VERDICTS[persona]
+        while entries and entries[0][2] < cutoff:
+            entries.popleft()  # Appended oldest first, so expired entries sit at the front
+        
+        for seen_words, exact_key, _ in entries:
+            union = len(words | seen_words)
+            score = len(words & seen_words) / union if union else 0.0
+            if score >= SIMILARITY_THRESHOLD:
+                candidates.append((score, exact_key))
+    
+    # Best match first; skip entries whose verdict has expired or been cleared
+    for _, exact_key in sorted(candidates, key=lambda candidate: candidate[0], reverse=True):
+        verdict = LLM_CACHE.get(exact_key)
+        if verdict is not None:
+            return verdict
+    return None
+
+
+def _get_cached_verdict(
+    persona: str,
+    article_title: str,
+    article_summary: str,
+    article_link: str = ""
+) -> Optional[bool]:
+    """Check the seen-link cache, the exact-match cache, then the near-duplicate cache."""
+    link_key = _seen_link_key(persona, article_link)
+    cached = LLM_CACHE.get(link_key) if link_key else None
+    if cached is not None:
+        return cached
+    cached = LLM_CACHE.get(_classification_key(persona, article_title, article_summary))
+    if cached is not None:
+        return cached
+    return _lookup_similar_verdict(persona, _word_set(article_title, article_summary))
+
+
+def _store_verdict(
+    persona: str,
+    article_title: str,
+    article_summary: str,
+    verdict: bool,
+    article_link: str = ""
+) -> None:
+    """Record a fresh LLM verdict in every cache."""
+    exact_key = _classification_key(persona, article_title, article_summary)
+    words = _word_set(article_title, article_summary)
+    stored_at = time.time()
     
-    return all_articles
+    LLM_CACHE.set(exact_key, verdict, expire=LLM_CACHE_TTL)
+    # Word set persisted next to the verdict so the index survives restarts
+    LLM_CACHE.set(("similar",) + exact_key[1:], (tuple(words), stored_at), expire=LLM_CACHE_TTL)
+    link_key = _seen_link_key(persona, article_link)
+    if link_key:
+        LLM_CACHE.set(link_key, verdict, expire=SEEN_LINK_TTL)
+    with _RECENT_VERDICTS_LOCK:
+        _RECENT_VERDICTS[persona].append((words, exact_key, stored_at))
+
+
+def _load_recent_verdicts() -> None:
+    """Rebuild the near-duplicate index from the unexpired entries in LLM_CACHE."""
+    entries = []
+    for key in LLM_CACHE.iterkeys():
+        if isinstance(key, tuple) and key[0] == "similar":
+            value = LLM_CACHE.get(key)
+            if value is not None:
+                words, stored_at = value
+                entries.append((stored_at, key[1], frozenset(words), ("classify",) + key[1:]))
+    
+    entries.sort(key=lambda entry: entry[0])
+    with _RECENT_VERDICTS_LOCK:
+        for stored_at, persona, words, exact_key in entries:
+            _RECENT_VERDICTS[persona].append((words, exact_key, stored_at))
+
+
+_load_recent_verdicts()
+
+
+# ============ IN-FLIGHT DEDUPLICATION ============
+# Streamlit sessions share this module, so the same classification can be
+# requested concurrently; only the first caller asks Mistral, the rest wait.
+_INFLIGHT: Dict[tuple, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _claim_inflight(keys: List[tuple]) -> Tuple[List[int], List[Tuple[int, Future]]]:
+    """
+    Register the keys nobody is classifying yet.
+    
+    Returns the positions this caller now owns, plus (position, future)
+    pairs for keys already in flight elsewhere.
+    """
+    owned, waiting = [], []
+    with _INFLIGHT_LOCK:
+        for pos, key in enumerate(keys):
+            if key in _INFLIGHT:
+                waiting.append((pos, _INFLIGHT[key]))
+            else:
+                _INFLIGHT[key] = Future()
+                owned.append(pos)
+    return owned, waiting
+
+
+def _release_inflight(key: tuple, verdict: bool) -> None:
+    """Publish an owned key's verdict to any waiters."""
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.pop(key)
+    future.set_result(verdict)
+
+
+def _fail_inflight(key: tuple, error: BaseException) -> None:
+    """Hand the owner's failure to any waiters instead of a made-up verdict."""
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.pop(key)
+    future.set_exception(error)
+
 
 # ============ MISTRAL CLASSIFICATION FUNCTION ============
+CLASSIFY_BATCH_SIZE = 8  # Articles per batched Mistral prompt
+
+# Static instructions go first, as the system message, so Ollama can reuse the KV
+# cache for them; only the persona and article text vary in the user message.
+_CLASSIFIER_GUIDELINES = """You are a relevance classifier for an AI news digest.
+You are given a target persona and one or more articles (title and summary).
+Decide whether each article would be useful to that persona.
+
+Guidelines:
+- Relevant means the article's main subject matters to the persona's work, decisions or learning.
+- Not relevant means the topic is unrelated, or only mentioned in passing.
+- Judge each article on its own; do not explain your reasoning."""
+
+CLASSIFIER_SYSTEM_PROMPT = _CLASSIFIER_GUIDELINES + """
+
+Answer with ONLY 'yes' or 'no'."""
+
+BATCH_CLASSIFIER_SYSTEM_PROMPT = _CLASSIFIER_GUIDELINES + """
+
+Reply with ONLY a JSON object of the form {"relevant": [one true/false per article, in order]}."""
+
+# User-message templates, filled per call with format_map
+MAX_SUMMARY_CHARS = 300  # Same cut as fetch; keeps oversized summaries from ballooning the prompt
+_PROMPT_TMPL = "Persona: {persona}\nTitle: {title}\nSummary: {summary}\nAnswer:"
+_BATCH_ITEM_TMPL = "{num}. TITLE: {title}\n   SUMMARY: {summary}"
+_BATCH_PROMPT_TMPL = "Persona: {persona}\n\n{articles}\n\nGive exactly {count} labels:"
+
+
+def _classify_single(
+    article_title: str,
+    article_summary: str,
+    persona: str,
+    article_link: str = ""
+) -> bool:
+    """
+    Classify one article with a plain yes/no prompt.
+    
+    Used as the fallback when a batched reply can't be parsed.
+    """
+    try:
+        response = _post_chat(
+            {
+                "model": MISTRAL_MODEL,
+                "messages": [
+                    {"role": "system", "content": CLASSIFIER_SYSTEM_PROMPT},
+                    {
+                        "role": "user",
+                        "content": _PROMPT_TMPL.format_map({
+                            "persona": persona,
+                            "title": article_title,
+                            "summary": article_summary[:MAX_SUMMARY_CHARS]
+                        })
+                    }
+                ],
+                "stream": False,
+                # A yes/no answer needs a couple of tokens; stop generating right after it
+                "options": {"temperature": 0.0, "top_k": 1, "num_predict": 2, "stop": ["\n"]}
+            },
+            timeout=30
+        )
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            words = result.get("message", {}).get("content", "").lower().split()
+            is_relevant = bool(words) and words[0].strip(".,!'\"") == "yes"
+            _store_verdict(persona, article_title, article_summary, is_relevant, article_link)
+            return is_relevant
+        else:
+            return False
+    except ModelNotFoundError:
+        raise  # Not a per-article failure; let the app report it
+    except Exception as e:
+        print(f"❌ Error classifying with Mistral: {str(e)}")
+        return False
+
+
+def _request_batch_labels(articles: List[Dict], persona: str) -> Optional[List[bool]]:
+    """
+    Ask Mistral for one relevance label per article in a single call.
+    
+    Returns the labels in order, or None if the reply isn't a list of
+    exactly len(articles) booleans.
+    """
+    articles_text = "\n".join(
+        _BATCH_ITEM_TMPL.format_map({
+            "num": num,
+            "title": article["title"],
+            "summary": article["summary"][:MAX_SUMMARY_CHARS]
+        })
+        for num, article in enumerate(articles, 1)
+    )
+    
+    try:
+        response = _post_chat(
+            {
+                "model": MISTRAL_MODEL,
+                "messages": [
+                    {"role": "system", "content": BATCH_CLASSIFIER_SYSTEM_PROMPT},
+                    {
+                        "role": "user",
+                        "content": _BATCH_PROMPT_TMPL.format_map({
+                            "persona": persona,
+                            "articles": articles_text,
+                            "count": len(articles)
+                        })
+                    }
+                ],
+                "stream": False,
+                "format": "json",
+                "options": {
+                    "temperature": 0.0,  # Deterministic labels
+                    "top_k": 1,
+                    # Room for a pretty-printed JSON list; a truncated reply forces the per-article fallback
+                    "num_predict": 32 + 8 * len(articles)
+                }
+            },
+            timeout=120
+        )
+        response.raise_for_status()
+        
+        parsed = orjson.loads(orjson.loads(response.content).get("message", {}).get("content", ""))
+        labels = parsed.get("relevant") if isinstance(parsed, dict) else parsed
+    except ModelNotFoundError:
+        raise  # Falling back per-article would only repeat the 404
+    except Exception as e:
+        print(f"❌ Error batch classifying with Mistral: {str(e)}")
+        return None
+    
+    if not isinstance(labels, list) or len(labels) != len(articles):
+        return None
+    if not all(isinstance(label, bool) for label in labels):
+        return None
+    return labels
+
+
+def _classify_chunk(articles: List[Dict], persona: str) -> List[bool]:
+    """
+    Classify up to one batch prompt's worth of uncached articles.
+    
+    Keys another caller is already classifying are awaited instead of
+    being sent to Mistral a second time.
+    """
+    keys = [
+        _classification_key(persona, article["title"], article["summary"])
+        for article in articles
+    ]
+    owned, waiting = _claim_inflight(keys)
+    chunk_verdicts = {}
+    
+    try:
+        if owned:
+            owned_articles = [articles[pos] for pos in owned]
+            labels = _request_batch_labels(owned_articles, persona)
+            
+            if labels is None:
+                print("⚠️ Unusable batch reply from Mistral, falling back to per-article")
+                # Dispatch the per-article calls concurrently so their latency overlaps
+                with ThreadPoolExecutor(max_workers=CLASSIFY_WORKERS) as executor:
+                    labels = list(executor.map(
+                        lambda article: _classify_single(
+                            article["title"], article["summary"], persona, article.get("link", "")
+                        ),
+                        owned_articles
+                    ))
+            else:
+                # One transaction for the whole batch instead of a commit per write
+                with LLM_CACHE.transact():
+                    for article, label in zip(owned_articles, labels):
+                        _store_verdict(
+                            persona, article["title"], article["summary"], label, article.get("link", "")
+                        )
+            
+            chunk_verdicts = dict(zip(owned, labels))
+    except BaseException as exc:
+        # Also covers Streamlit interrupting a rerun, so waiters never hang
+        for pos in owned:
+            _fail_inflight(keys[pos], exc)
+        raise
+    
+    for pos in owned:
+        _release_inflight(keys[pos], chunk_verdicts[pos])
+    
+    # Our own keys are released first, so waiting here can't deadlock;
+    # an owner's failure is re-raised here rather than read as "not relevant"
+    for pos, future in waiting:
+        chunk_verdicts[pos] = future.result()
+    
+    return [chunk_verdicts[pos] for pos in range(len(articles))]
+
+
+def classify_batch(
+    articles: List[Dict],
+    persona: str,
+    k: int = CLASSIFY_BATCH_SIZE
+) -> List[bool]:
+    """
+    Use Mistral 7B to classify article relevance, up to k articles per call.
+    
+    Chunks are sent concurrently (up to CLASSIFY_WORKERS at once), still
+    bounded overall by the Ollama slots in _post_chat.
+    
+    Args:
+        articles: List of article dictionaries to classify
+        persona: The persona to classify for
+        k: Maximum number of articles per Mistral prompt
+        
+    Returns:
+        One boolean per article, in order
+        
+    Raises:
+        ModelNotFoundError: If MISTRAL_MODEL isn't pulled in Ollama
+    """
+    verdicts = [
+        _get_cached_verdict(persona, article["title"], article["summary"], article.get("link", ""))
+        for article in articles
+    ]
+    pending = [idx for idx, verdict in enumerate(verdicts) if verdict is None]
+    chunks = [pending[start:start + k] for start in range(0, len(pending), k)]
+    
+    def run_chunk(chunk: List[int]) -> List[bool]:
+        return _classify_chunk([articles[idx] for idx in chunk], persona)
+    
+    if len(chunks) == 1:
+        results = [run_chunk(chunks[0])]
+    elif chunks:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), CLASSIFY_WORKERS)) as executor:
+            results = list(executor.map(run_chunk, chunks))
+    else:
+        results = []
+    
+    for chunk, chunk_verdicts in zip(chunks, results):
+        for idx, verdict in zip(chunk, chunk_verdicts):
+            verdicts[idx] = verdict
+    
+    return [bool(verdict) for verdict in verdicts]
+
+
 def classify_with_mistral(
     article_title: str, 
     article_summary: str, 
@@ -57,35 +708,48 @@ def classify_with_mistral(
     Returns:
         Boolean indicating if article is relevant
     """
-    
-    prompt = f"""Classify if this article is relevant to a {persona}.
+    article = {"title": article_title, "summary": article_summary}
+    return classify_batch([article], persona, k=1)[0]
 
-Article Title: {article_title}
-Article Summary: {article_summary}
 
-Is this article relevant to {persona}? Answer with ONLY "yes" or "no":"""
+def classify_articles_with_mistral(
+    articles: List[Dict],
+    persona: str,
+    limit: Optional[int] = None
+) -> List[Dict]:
+    """
+    Use Mistral 7B to classify articles in batched calls.
     
-    try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": "mistral",
-                "prompt": prompt,
-                "stream": False,
-                "temperature": 0.1  # Low temperature for consistent classification
-            },
-            timeout=30
-        )
+    Args:
+        articles: List of article dictionaries to classify
+        persona: The persona to classify for
+        limit: Stop classifying once this many relevant articles are found
         
-        if response.status_code == 200:
-            result = response.json()
-            response_text = result.get("response", "").lower().strip()
-            return "yes" in response_text or "relevant" in response_text
-        else:
-            return False
-    except Exception as e:
-        print(f"❌ Error classifying with Mistral: {str(e)}")
-        return False
+    Returns:
+        List of the articles judged relevant, in their original order
+        
+    Raises:
+        ModelNotFoundError: If MISTRAL_MODEL isn't pulled in Ollama
+    """
+    if not articles:
+        return []
+    
+    relevant_articles = []
+    # Up to CLASSIFY_WORKERS full batches go out together; without a limit
+    # there is nothing to stop early for, so everything goes in one wave
+    wave_size = CLASSIFY_BATCH_SIZE * CLASSIFY_WORKERS if limit else len(articles)
+    
+    # Always fill whole batches, even when only a few more hits are needed;
+    # the result is trimmed to limit below
+    for start in range(0, len(articles), wave_size):
+        wave = articles[start:start + wave_size]
+        verdicts = classify_batch(wave, persona)
+        relevant_articles.extend(article for article, verdict in zip(wave, verdicts) if verdict)
+        
+        if limit and len(relevant_articles) >= limit:
+            break  # Enough found, skip the remaining LLM calls
+    
+    return relevant_articles[:limit] if limit else relevant_articles
 
 # ============ ADD CUSTOM PERSONAS ============
 def get_personas() -> Dict:
@@ -110,20 +774,63 @@ def get_personas() -> Dict:
         }
     }
 
+# ============ KEYWORD PREFILTER ============
+# Persona keywords pre-tokenized once; each keyword is the word set it must cover
+_PERSONA_KEYWORDS = {
+    name: tuple(frozenset(_WORD_RE.findall(keyword.lower())) for keyword in config["keywords"])
+    for name, config in get_personas().items()
+}
+
+
+def prefilter(article: Dict, persona: str) -> Optional[bool]:
+    """
+    Cheap keyword check that settles clear-cut articles without the LLM.
+    
+    Args:
+        article: Article dictionary with title and summary
+        persona: The persona to classify for
+        
+    Returns:
+        False if no persona keyword appears, True if two or more distinct
+        keywords appear, None if the LLM should decide
+    """
+    keywords = _PERSONA_KEYWORDS.get(persona)
+    if keywords is None:
+        return None
+    
+    # Tokenize once, then each keyword is a C-level subset test on the word set
+    words = _word_set(article["title"], article["summary"])
+    hits = 0
+    for keyword in keywords:
+        if keyword <= words:
+            hits += 1
+            if hits >= 2:
+                return True
+    return False if hits == 0 else None
+
 # ============ HELPER FUNCTIONS ============
+_FMT = """
+    Title: {title}
+    Summary: {summary}
+    Source: {source}
+    Link: {link}
+    """
+
+
 def format_article(article: Dict) -> str:
     """Format an article for display."""
-    return f"""
-    Title: {article['title']}
-    Summary: {article['summary']}
-    Source: {article['source']}
-    Link: {article['link']}
-    """
+    return _FMT.format_map(article)
+
+
+def format_articles(articles: List[Dict]) -> str:
+    """Format several articles for display in one string."""
+    return "".join(_FMT.format_map(article) for article in articles)
+
 
 def validate_ollama_connection() -> bool:
     """Check if Ollama server is running."""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = OLLAMA_SESSION.get("http://localhost:11434/api/tags", timeout=5)
         return response.status_code == 200
     except:
         return False